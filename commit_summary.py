@@ -1,11 +1,34 @@
 #!/usr/bin/env python3
 import os
-import requests
+import asyncio
+from collections import defaultdict
+import httpx
+from aiolimiter import AsyncLimiter
+import ijson
+import requests_cache
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import datetime
-import json
+import email.utils
+import functools
+import hashlib
+import importlib.util
+import orjson
+import random
+import re
+import sqlite3
+import time
+from ratelimit import limits, sleep_and_retry
 from dotenv import load_dotenv
 from anthropic import Anthropic
 
+# Optional: embeddings + sqlite-vec let near-identical commit data reuse a cached summary.
+# sentence_transformers pulls in torch, so it's only imported when an embedding is needed.
+try:
+    import sqlite_vec
+except ImportError:
+    sqlite_vec = None
+
 # Load environment variables
 load_dotenv(override=True)
 
@@ -13,81 +36,496 @@ load_dotenv(override=True)
 GITHUB_TOKEN = os.getenv('GITHUB_TOKEN')
 ANTHROPIC_API_KEY = os.getenv('ANTHROPIC_API_KEY')
 
+# Empty or placeholder Anthropic keys (e.g. copied from .env.example) mean we skip Claude
+_BAD_KEY = re.compile(r'^(your_|ANTHROPIC|$)')
+
 # GitHub API headers
 headers = {
     'Authorization': f'token {GITHUB_TOKEN}',
     'Accept': 'application/vnd.github.v3+json'
 }
 
-# Calculate date one week ago
-one_week_ago = (datetime.datetime.now() - datetime.timedelta(days=7)).strftime('%Y-%m-%dT%H:%M:%SZ')
+# Rate-limit retry policy for GitHub calls
+MAX_RETRIES = 6
+RETRY_BACKOFF_BASE = 2
+RETRY_BACKOFF_CAP = 60
+RETRY_JITTER = 1
+
+# Client-side pacing under GitHub's documented limits (5000 core requests/hour,
+# 30 searches/minute) so we slow down before GitHub makes us back off
+CORE_RATE_LIMIT = 5000
+CORE_RATE_PERIOD = 3600
+SEARCH_RATE_LIMIT = 30
+SEARCH_RATE_PERIOD = 60
+core_limiter = AsyncLimiter(CORE_RATE_LIMIT, CORE_RATE_PERIOD)
+search_limiter = AsyncLimiter(SEARCH_RATE_LIMIT, SEARCH_RATE_PERIOD)
+
+# Cache files live next to the script, not in whatever directory it's run from
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# On-disk response cache. Expired entries are revalidated with If-None-Match, and
+# GitHub's 304 replies don't count against the rate limit.
+CACHE_PATH = os.path.join(SCRIPT_DIR, 'gh_cache.sqlite')
+CACHE_TTL = datetime.timedelta(minutes=10)
+SEARCH_CACHE_TTL = datetime.timedelta(seconds=60)
+# Request URLs embed the hour-rounded cutoff, so async cache rows are useless after an hour
+ETAG_CACHE_RETENTION = datetime.timedelta(hours=1)
+
+def _token_cache_key(request, **kwargs):
+    """requests_cache key that also covers the token, so one user's /user is never served to another.
+    
+    match_headers can't do this: requests_cache strips Authorization before keying so it isn't stored.
+    """
+    token = request.headers.get('Authorization', '')
+    return f"{requests_cache.create_key(request, **kwargs)}-{hashlib.sha256(token.encode()).hexdigest()[:16]}"
+
+@functools.lru_cache(maxsize=1)
+def get_session():
+    """Shared session so every GitHub call reuses pooled keep-alive connections, opened on first use.
+    
+    urllib3 retries 5xx; 403/429 rate limits are handled once, in gh_get, like the async path.
+    """
+    session = requests_cache.CachedSession(
+        CACHE_PATH,
+        backend='sqlite',
+        cache_control=True,
+        expire_after=CACHE_TTL,
+        allowable_methods=['GET'],
+        key_fn=_token_cache_key
+    )
+    session.headers.update(headers)
+    adapter = HTTPAdapter(
+        pool_connections=20,
+        pool_maxsize=20,
+        max_retries=Retry(
+            total=MAX_RETRIES,
+            backoff_factor=RETRY_BACKOFF_BASE,
+            status_forcelist=[502, 503, 504],
+            respect_retry_after_header=True,
+            allowed_methods=['GET'],
+            raise_on_status=False
+        )
+    )
+    session.mount('https://', adapter)
+    return session
+
+# The httpx client can't use requests_cache, so async GETs keep their ETags in a table of their own.
+# Link is kept alongside the body because search pagination reads it.
+CACHED_HEADERS = ('Link',)
+# Bump whenever the etag_responses layout changes; older tables are dropped and rebuilt
+ETAG_CACHE_SCHEMA_VERSION = 1
+
+@functools.lru_cache(maxsize=1)
+def get_etag_cache():
+    """Open the async ETag cache on first use, dropping rows past ETAG_CACHE_RETENTION"""
+    db = sqlite3.connect(CACHE_PATH)
+    # requests_cache shares this file but doesn't touch user_version, so it tracks our table alone
+    if db.execute('PRAGMA user_version').fetchone()[0] != ETAG_CACHE_SCHEMA_VERSION:
+        db.execute('DROP TABLE IF EXISTS etag_responses')
+        db.execute(f'PRAGMA user_version = {ETAG_CACHE_SCHEMA_VERSION}')
+    db.execute(
+        'CREATE TABLE IF NOT EXISTS etag_responses '
+        '(url TEXT PRIMARY KEY, etag TEXT, body BLOB, headers BLOB, stored_at REAL)'
+    )
+    db.execute(
+        'DELETE FROM etag_responses WHERE stored_at < ?',
+        (time.time() - ETAG_CACHE_RETENTION.total_seconds(),)
+    )
+    db.commit()
+    return db
+
+# Commit search pagination; the search API never returns more than 1000 results
+SEARCH_PAGE_SIZE = 100
+SEARCH_MAX_RESULTS = 1000
+SEARCH_CONCURRENCY = 10
+
+# Pagination targets in GitHub's Link header
+NEXT_LINK = re.compile(r'(?<=<)([\S]*)(?=>; rel="[Nn]ext")')
+LAST_LINK = re.compile(r'(?<=<)([\S]*)(?=>; rel="[Ll]ast")')
+
+# Commits per page for the REST commits endpoint and GraphQL history (both cap at 100)
+COMMITS_PAGE_SIZE = 100
+
+# GraphQL batching; GitHub caps the number of nodes a single query may touch
+GRAPHQL_URL = 'https://api.github.com/graphql'
+GRAPHQL_BATCH_SIZE = 50
+
+COMMIT_HISTORY_FIELDS = """
+    defaultBranchRef {
+      target {
+        ... on Commit {
+          history(first: %d, since: $since, author: {id: $author}) {
+            nodes { oid authoredDate message }
+            pageInfo { hasNextPage }
+          }
+        }
+      }
+    }""" % COMMITS_PAGE_SIZE
+
+# Prompt for the Anthropic summary, built once; commit_data is substituted per call
+SUMMARY_PROMPT_TEMPLATE = """
+    Here are my GitHub commits from the past week:
+    
+    {commit_data}
+    
+    Please provide a concise, bulleted summary of what I did for each repository. 
+    Focus on the actual work accomplished rather than just listing commit messages. 
+    Group related commits together into meaningful accomplishments.
+    Format the output as follows:
+    
+    # Repository Name
+    - Accomplishment 1 (with technical details)
+    - Accomplishment 2 (with technical details)
+    
+    # Another Repository Name
+    - Accomplishment 1 (with technical details)
+    - Accomplishment 2 (with technical details)
+    """
+
+# Summary cache: exact hits by SHA-256, near-duplicates by embedding cosine similarity
+SUMMARY_CACHE_PATH = os.path.join(SCRIPT_DIR, 'summary_cache.sqlite')
+# Bump whenever the summaries or summary_embeddings layout changes; older files are discarded
+SUMMARY_CACHE_SCHEMA_VERSION = 1
+SUMMARY_CACHE_TTL = datetime.timedelta(hours=24)
+# Only applies to commit data that fits the model's max_seq_length (256 word pieces for
+# all-MiniLM-L6-v2). Longer input would be embedded from a truncated prefix, so two dumps that
+# differ past it would look identical; those only ever get exact-match hits.
+SUMMARY_SIMILARITY_THRESHOLD = 0.95
+EMBEDDING_MODEL = 'all-MiniLM-L6-v2'
+EMBEDDING_DIM = 384
+
+def _enable_semantic_cache(db):
+    """Load sqlite-vec into the summary cache, returning False if it isn't available"""
+    if sqlite_vec is None or importlib.util.find_spec('sentence_transformers') is None:
+        return False
+    
+    try:
+        db.enable_load_extension(True)
+        sqlite_vec.load(db)
+        db.enable_load_extension(False)
+    except (AttributeError, sqlite3.OperationalError):
+        # Some Python builds ship sqlite3 without extension loading
+        return False
+    
+    db.execute(
+        'CREATE VIRTUAL TABLE IF NOT EXISTS summary_embeddings '
+        f'USING vec0(embedding float[{EMBEDDING_DIM}] distance_metric=cosine)'
+    )
+    return True
+
+@functools.lru_cache(maxsize=1)
+def get_summary_cache():
+    """Open the summary cache on first use, returning (connection, whether semantic lookups work)"""
+    db = sqlite3.connect(SUMMARY_CACHE_PATH)
+    if db.execute('PRAGMA user_version').fetchone()[0] != SUMMARY_CACHE_SCHEMA_VERSION:
+        # Nothing here but cached summaries, so start a fresh file rather than migrate. Dropping
+        # summary_embeddings table by table would need sqlite-vec, which may not be installed.
+        db.close()
+        os.remove(SUMMARY_CACHE_PATH)
+        db = sqlite3.connect(SUMMARY_CACHE_PATH)
+        db.execute(f'PRAGMA user_version = {SUMMARY_CACHE_SCHEMA_VERSION}')
+    db.execute(
+        'CREATE TABLE IF NOT EXISTS summaries '
+        '(id INTEGER PRIMARY KEY AUTOINCREMENT, digest TEXT UNIQUE, commit_data TEXT, summary TEXT, stored_at REAL)'
+    )
+    return db, _enable_semantic_cache(db)
+
+def since_iso(days=7):
+    """Return the UTC timestamp `days` ago in the ISO 8601 form GitHub expects.
+    
+    Rounded down to the hour so request URLs, and with them cache keys, repeat between runs.
+    """
+    since = datetime.datetime.now(datetime.timezone.utc) - datetime.timedelta(days=days)
+    return since.replace(minute=0, second=0, microsecond=0).isoformat().replace('+00:00', 'Z')
+
+def _parse_retry_after(value):
+    """Return the seconds a Retry-After header asks for (delay or HTTP-date form), or None"""
+    try:
+        return max(float(value), 0)
+    except ValueError:
+        pass
+    
+    try:
+        retry_at = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(retry_at.timestamp() - time.time(), 0)
+
+def _rate_limit_delay(status_code, response_headers, attempt):
+    """Return how long to wait before retrying a rate-limited response, or None if it isn't one"""
+    if status_code not in (403, 429):
+        return None
+    
+    retry_after = _parse_retry_after(response_headers.get('Retry-After') or '')
+    if retry_after is not None:
+        return retry_after
+    
+    if response_headers.get('X-RateLimit-Remaining') == '0':
+        reset_at = int(response_headers.get('X-RateLimit-Reset', 0))
+        return max(reset_at - time.time(), 0) + random.uniform(0, RETRY_JITTER)
+    
+    if status_code == 429:
+        return min(RETRY_BACKOFF_CAP, RETRY_BACKOFF_BASE * 2 ** attempt) + random.uniform(0, RETRY_JITTER)
+    
+    # A 403 without rate-limit headers is a genuine permission error
+    return None
+
+@sleep_and_retry
+@limits(calls=CORE_RATE_LIMIT, period=CORE_RATE_PERIOD)
+def _paced_session_get(url, **kwargs):
+    """session.get, paced by the client-side core rate limit"""
+    return get_session().get(url, **kwargs)
+
+def gh_get(url, **kwargs):
+    """GET a GitHub API URL, sleeping through rate limits before retrying"""
+    for attempt in range(MAX_RETRIES):
+        response = _paced_session_get(url, **kwargs)
+        delay = _rate_limit_delay(response.status_code, response.headers, attempt)
+        if delay is None or attempt == MAX_RETRIES - 1:
+            return response
+        
+        print(f"Rate limited by GitHub, retrying in {delay:.0f}s...")
+        time.sleep(delay)
+
+async def gh_request_async(client, method, url, stream=False, **kwargs):
+    """Async counterpart of gh_get for the shared httpx client.
+    
+    With stream=True the body is left unread and the caller must close the response.
+    """
+    limiter = search_limiter if '/search/' in url else core_limiter
+    for attempt in range(MAX_RETRIES):
+        async with limiter:
+            response = await client.send(client.build_request(method, url, **kwargs), stream=stream)
+        delay = _rate_limit_delay(response.status_code, response.headers, attempt)
+        if delay is None or attempt == MAX_RETRIES - 1:
+            return response
+        
+        await response.aclose()
+        print(f"Rate limited by GitHub, retrying in {delay:.0f}s...")
+        await asyncio.sleep(delay)
+
+async def gh_get_async(client, url, **kwargs):
+    """GET a GitHub API URL on the shared httpx client, serving cached bodies when unchanged"""
+    cache_key = str(httpx.URL(url, params=kwargs.get('params')))
+    ttl = SEARCH_CACHE_TTL if '/search/' in url else CACHE_TTL
+    etag_cache = get_etag_cache()
+    cached = etag_cache.execute(
+        'SELECT etag, body, headers, stored_at FROM etag_responses WHERE url = ?', (cache_key,)
+    ).fetchone()
+    
+    if cached:
+        etag, body, cached_headers, stored_at = cached
+        cached_headers = orjson.loads(cached_headers)
+        if time.time() - stored_at < ttl.total_seconds():
+            return httpx.Response(200, content=body, headers=cached_headers)
+        kwargs['headers'] = {**kwargs.get('headers', {}), 'If-None-Match': etag}
+    
+    response = await gh_request_async(client, 'GET', url, **kwargs)
+    
+    if response.status_code == 304 and cached:
+        etag_cache.execute('UPDATE etag_responses SET stored_at = ? WHERE url = ?', (time.time(), cache_key))
+        etag_cache.commit()
+        return httpx.Response(200, content=body, headers=cached_headers)
+    
+    if response.status_code == 200 and response.headers.get('ETag'):
+        kept_headers = {name: response.headers[name] for name in CACHED_HEADERS if name in response.headers}
+        etag_cache.execute(
+            'INSERT OR REPLACE INTO etag_responses VALUES (?, ?, ?, ?, ?)',
+            (cache_key, response.headers['ETag'], response.content, orjson.dumps(kept_headers), time.time())
+        )
+        etag_cache.commit()
+    
+    return response
 
 def get_user_info():
     """Get authenticated user information"""
     url = 'https://api.github.com/user'
-    response = requests.get(url, headers=headers)
+    response = gh_get(url)
     if response.status_code != 200:
         print(f"Error fetching user info: {response.status_code}")
         print(response.text)
         return None
-    return response.json()
-
-def get_user_commits_in_repos():
-    """Get repositories where the authenticated user has made commits"""
-    user_info = get_user_info()
-    if not user_info:
-        return []
-    
-    user_login = user_info['login']
-    url = f'https://api.github.com/search/commits?q=author:{user_login}+author-date:>{one_week_ago}'
-    repos_with_commits = set()
-    page = 1
-    
-    while True:
-        response = requests.get(
-            f'{url}&page={page}&per_page=100', 
-            headers={**headers, 'Accept': 'application/vnd.github.cloak-preview+json'}
+    return orjson.loads(response.content)
+
+async def fetch_search_page(client, semaphore, params, page):
+    """Fetch a single page of commit search results, returning (data, Link header)"""
+    async with semaphore:
+        response = await gh_get_async(
+            client,
+            'https://api.github.com/search/commits',
+            params={**params, 'page': page, 'per_page': SEARCH_PAGE_SIZE},
+            headers={'Accept': 'application/vnd.github.cloak-preview+json'}
         )
-        
         if response.status_code != 200:
-            print(f"Error fetching commits: {response.status_code}")
+            print(f"Error fetching commits (page {page}): {response.status_code}")
             print(response.text)
-            break
+            return None, ''
         
-        data = response.json()
-        if not data.get('items'):
-            break
-            
-        for item in data['items']:
-            repo_url = item['repository']['url']
-            repo_owner = repo_url.split('/')[-2]
-            repo_name = repo_url.split('/')[-1]
-            repos_with_commits.add((repo_owner, repo_name))
+        return orjson.loads(response.content), response.headers.get('Link', '')
+
+def trim_rest_commit(commit):
+    """Keep only the fields format_commit_data needs from a REST commit object"""
+    return {
+        'sha': commit['sha'][:7],
+        'date': commit['commit']['author']['date'],
+        'message': commit['commit']['message']
+    }
+
+async def get_user_commits_in_repos(client, user_login, since_date):
+    """Get the authenticated user's commits from the commit search, grouped by repository.
+    
+    Returns (commits_by_repo, complete); complete is False when the search hit its
+    result cap or a page failed, so some commits may be missing.
+    """
+    # An explicit sort keeps page boundaries stable while pages are fetched concurrently,
+    # and keeps the newest commits when the result cap cuts the list short
+    params = {'q': f'author:{user_login} author-date:>{since_date}', 'sort': 'author-date', 'order': 'desc'}
+    semaphore = asyncio.Semaphore(SEARCH_CONCURRENCY)
+    
+    # The first page's Link header says whether there are more pages and where they end,
+    # so the rest can be fetched at once
+    first_page, link_header = await fetch_search_page(client, semaphore, params, 1)
+    if not first_page:
+        return {}, False
+    if not first_page.get('items'):
+        return {}, True
+    
+    complete = first_page.get('total_count', 0) <= SEARCH_MAX_RESULTS
+    n_pages = 1
+    if NEXT_LINK.search(link_header):
+        last_link = LAST_LINK.search(link_header)
+        if last_link:
+            n_pages = int(httpx.URL(last_link.group(1)).params['page'])
+        else:
+            n_pages = -(-min(first_page.get('total_count', 0), SEARCH_MAX_RESULTS) // SEARCH_PAGE_SIZE)
+    
+    other_pages = await asyncio.gather(*[
+        fetch_search_page(client, semaphore, params, page)
+        for page in range(2, n_pages + 1)
+    ])
+    
+    # Search items carry sha and commit.author/message, same as the REST commit objects
+    commits_by_repo = defaultdict(list)
+    for data in [first_page, *(data for data, _ in other_pages)]:
+        if not data:
+            complete = False
+            continue
         
-        if page * 100 >= data.get('total_count', 0):
-            break
-            
-        page += 1
+        for item in data.get('items', []):
+            repo = item['repository']
+            commits_by_repo[(repo['owner']['login'], repo['name'])].append(trim_rest_commit(item))
     
-    return list(repos_with_commits)
+    return dict(commits_by_repo), complete
 
-def get_user_commits(repo_owner, repo_name, since_date):
-    """Get all commits for a specific repository since the given date"""
+async def get_user_commits(client, repo_owner, repo_name, author_login, since_date):
+    """Get the user's commits for a specific repository since the given date"""
     url = f'https://api.github.com/repos/{repo_owner}/{repo_name}/commits'
-    params = {'since': since_date}
+    params = {'author': author_login, 'since': since_date, 'per_page': COMMITS_PAGE_SIZE}
+    commits = []
+    
+    while url:
+        # Stream-parse the array so only one full commit object is held in memory at a time
+        response = await gh_request_async(client, 'GET', url, stream=True, params=params)
+        try:
+            if response.status_code != 200:
+                await response.aread()
+                print(f"Error fetching commits for {repo_owner}/{repo_name}: {response.status_code}")
+                print(response.text)
+                return commits
+            
+            events = ijson.sendable_list()
+            parser = ijson.items_coro(events, 'item')
+            async for chunk in response.aiter_bytes():
+                parser.send(chunk)
+                commits.extend(trim_rest_commit(commit) for commit in events)
+                del events[:]
+            parser.close()
+            commits.extend(trim_rest_commit(commit) for commit in events)
+            next_link = NEXT_LINK.search(response.headers.get('Link', ''))
+        finally:
+            await response.aclose()
+        
+        # The next link already carries the query string
+        url = next_link.group(1) if next_link else None
+        params = None
+    
+    return commits
+
+def build_commit_history_query(repos):
+    """Build one GraphQL query with an aliased repository lookup per repo"""
+    fields = []
+    for i, (repo_owner, repo_name) in enumerate(repos):
+        # JSON string literals are valid GraphQL string literals
+        owner_literal = orjson.dumps(repo_owner).decode()
+        name_literal = orjson.dumps(repo_name).decode()
+        fields.append(f"  repo{i}: repository(owner: {owner_literal}, name: {name_literal}) {{{COMMIT_HISTORY_FIELDS}\n  }}")
     
-    response = requests.get(url, headers=headers, params=params)
+    return "query($since: GitTimestamp!, $author: ID!) {\n" + "\n".join(fields) + "\n}"
+
+async def get_commit_history_batch(client, repos, author_id, since_date):
+    """Get the user's commits for a batch of repositories in a single GraphQL query"""
+    payload = {
+        'query': build_commit_history_query(repos),
+        'variables': {'since': since_date, 'author': author_id}
+    }
+    response = await gh_request_async(
+        client,
+        'POST',
+        GRAPHQL_URL,
+        content=orjson.dumps(payload),
+        headers={'Content-Type': 'application/json'}
+    )
     if response.status_code != 200:
-        print(f"Error fetching commits for {repo_owner}/{repo_name}: {response.status_code}")
+        print(f"Error fetching commit history: {response.status_code}")
         print(response.text)
-        return []
+        return {}
     
-    commits = response.json()
-    return commits
+    data = orjson.loads(response.content).get('data') or {}
+    commits_by_repo = {}
+    for i, repo in enumerate(repos):
+        repository = data.get(f'repo{i}')
+        if not repository:
+            continue
+        
+        branch = repository.get('defaultBranchRef')
+        history = branch['target']['history'] if branch else {'nodes': [], 'pageInfo': {'hasNextPage': False}}
+        if history['pageInfo']['hasNextPage']:
+            # Leave it out so get_commits_for_repos pages through it over REST instead
+            print(f"More than {COMMITS_PAGE_SIZE} commits in {repo[0]}/{repo[1]}; fetching the full list separately...")
+            continue
+        
+        commits_by_repo[repo] = [
+            {'sha': node['oid'][:7], 'date': node['authoredDate'], 'message': node['message']}
+            for node in history['nodes']
+        ]
+    
+    return commits_by_repo
+
+async def get_commits_for_repos(client, repos, user_info, since_date):
+    """Get the user's commits for every repository, batching GraphQL lookups"""
+    batches = await asyncio.gather(*[
+        get_commit_history_batch(client, repos[i:i + GRAPHQL_BATCH_SIZE], user_info['node_id'], since_date)
+        for i in range(0, len(repos), GRAPHQL_BATCH_SIZE)
+    ])
+    
+    commits_by_repo = {}
+    for batch in batches:
+        commits_by_repo.update(batch)
+    
+    # Fall back to the REST endpoint for anything GraphQL couldn't resolve
+    missing = [repo for repo in repos if repo not in commits_by_repo]
+    results = await asyncio.gather(*[
+        get_user_commits(client, repo_owner, repo_name, user_info['login'], since_date)
+        for repo_owner, repo_name in missing
+    ])
+    commits_by_repo.update(zip(missing, results))
+    
+    return commits_by_repo
 
 def format_commit_data(repos_with_commits):
     """Format commit data for LLM processing"""
     formatted_data = []
+    append = formatted_data.append
     
     for repo_data in repos_with_commits:
         repo_name = repo_data['repo_name']
@@ -96,15 +534,12 @@ def format_commit_data(repos_with_commits):
         if not commits:
             continue
             
-        formatted_data.append(f"Repository: {repo_name}")
+        append(f"Repository: {repo_name}")
         
         for commit in commits:
-            commit_sha = commit['sha'][:7]
-            commit_date = commit['commit']['author']['date']
-            commit_message = commit['commit']['message']
-            formatted_data.append(f"  - [{commit_sha}] {commit_date}: {commit_message}")
+            append(f"  - [{commit['sha']}] {commit['date']}: {commit['message']}")
         
-        formatted_data.append("")
+        append("")
     
     return "\n".join(formatted_data)
 
@@ -131,17 +566,12 @@ def generate_basic_summary(commit_data):
         summary_parts.append(f"# {repo}")
         
         # Group commits by message to consolidate similar work
-        commit_messages = {}
+        commit_messages = defaultdict(list)
         for commit in commits:
             # Extract commit message from the format [sha] date: message
-            parts = commit.split(':', 1)
-            if len(parts) > 1:
-                message = parts[1].strip()
-                sha_date = parts[0].strip()
-                if message in commit_messages:
-                    commit_messages[message].append(sha_date)
-                else:
-                    commit_messages[message] = [sha_date]
+            sha_date, separator, message = commit.partition(': ')
+            if separator:
+                commit_messages[message.strip()].append(sha_date.strip())
         
         # Add each unique commit message
         for message, sha_dates in commit_messages.items():
@@ -151,37 +581,94 @@ def generate_basic_summary(commit_data):
     
     return '\n'.join(summary_parts)
 
-def generate_summary_with_anthropic(commit_data):
-    """Generate a summary of commits using Anthropic's Claude"""
-    # First try to generate a basic summary without using the API
-    basic_summary = generate_basic_summary(commit_data)
+@functools.lru_cache(maxsize=1)
+def get_embedding_model():
+    """Load the sentence embedding model once, on first use"""
+    from sentence_transformers import SentenceTransformer
+    return SentenceTransformer(EMBEDDING_MODEL)
+
+@functools.lru_cache(maxsize=1)
+def embed_commit_data(commit_data):
+    """Embed commit data for the semantic cache (memoized between lookup and store).
     
-    # If Anthropic API is not available or has credit issues, return the basic summary
-    if not ANTHROPIC_API_KEY or ANTHROPIC_API_KEY.startswith('your_') or 'ANTHROPIC_API_KEY' in ANTHROPIC_API_KEY:
-        print("Anthropic API key not properly configured. Using basic summary.")
-        return basic_summary
+    Returns None if the model would truncate it, since the embedding wouldn't cover all of it.
+    """
+    model = get_embedding_model()
+    if len(model.tokenizer(commit_data, verbose=False)['input_ids']) > model.max_seq_length:
+        return None
+    embedding = model.encode(commit_data, normalize_embeddings=True)
+    return sqlite_vec.serialize_float32(embedding.tolist())
+
+def _purge_expired_summaries():
+    """Drop cached summaries older than SUMMARY_CACHE_TTL"""
+    summary_cache, semantic_cache_enabled = get_summary_cache()
+    cutoff = time.time() - SUMMARY_CACHE_TTL.total_seconds()
+    summary_cache.execute('DELETE FROM summaries WHERE stored_at <= ?', (cutoff,))
+    if semantic_cache_enabled:
+        # Also catches embeddings orphaned by runs that couldn't load sqlite-vec
+        summary_cache.execute('DELETE FROM summary_embeddings WHERE rowid NOT IN (SELECT id FROM summaries)')
+    summary_cache.commit()
+
+def get_cached_summary(commit_data):
+    """Return a cached summary for identical or near-identical commit data, or None"""
+    _purge_expired_summaries()
+    summary_cache, semantic_cache_enabled = get_summary_cache()
     
-    # Configure Anthropic client
-    client = Anthropic(api_key=ANTHROPIC_API_KEY)
+    digest = hashlib.sha256(commit_data.encode()).hexdigest()
+    row = summary_cache.execute('SELECT summary FROM summaries WHERE digest = ?', (digest,)).fetchone()
+    if row:
+        return row[0]
     
-    prompt = f"""
-    Here are my GitHub commits from the past week:
+    if not semantic_cache_enabled:
+        return None
     
-    {commit_data}
+    embedding = embed_commit_data(commit_data)
+    if embedding is None:
+        return None
     
-    Please provide a concise, bulleted summary of what I did for each repository. 
-    Focus on the actual work accomplished rather than just listing commit messages. 
-    Group related commits together into meaningful accomplishments.
-    Format the output as follows:
+    # Cosine distance is 1 - similarity
+    row = summary_cache.execute(
+        'WITH nearest AS ('
+        '  SELECT rowid, distance FROM summary_embeddings WHERE embedding MATCH ? AND k = 1'
+        ') '
+        'SELECT summaries.summary FROM nearest JOIN summaries ON summaries.id = nearest.rowid '
+        'WHERE nearest.distance < ?',
+        (embedding, 1 - SUMMARY_SIMILARITY_THRESHOLD)
+    ).fetchone()
+    return row[0] if row else None
+
+def store_summary(commit_data, summary):
+    """Cache a generated summary under its commit data's hash and embedding"""
+    summary_cache, semantic_cache_enabled = get_summary_cache()
+    digest = hashlib.sha256(commit_data.encode()).hexdigest()
+    cursor = summary_cache.execute(
+        'INSERT OR IGNORE INTO summaries (digest, commit_data, summary, stored_at) VALUES (?, ?, ?, ?)',
+        (digest, commit_data, summary, time.time())
+    )
+    embedding = embed_commit_data(commit_data) if cursor.rowcount and semantic_cache_enabled else None
+    if embedding is not None:
+        summary_cache.execute(
+            'INSERT INTO summary_embeddings (rowid, embedding) VALUES (?, ?)',
+            (cursor.lastrowid, embedding)
+        )
+    summary_cache.commit()
+
+def generate_summary_with_anthropic(commit_data):
+    """Generate a summary of commits using Anthropic's Claude"""
+    try:
+        cached_summary = get_cached_summary(commit_data)
+    except Exception as e:
+        print(f"Error reading summary cache: {e}")
+        cached_summary = None
     
-    # Repository Name
-    - Accomplishment 1 (with technical details)
-    - Accomplishment 2 (with technical details)
+    if cached_summary:
+        print("Using cached summary for matching commits.")
+        return cached_summary
     
-    # Another Repository Name
-    - Accomplishment 1 (with technical details)
-    - Accomplishment 2 (with technical details)
-    """
+    # Configure Anthropic client
+    client = Anthropic(api_key=ANTHROPIC_API_KEY)
+    
+    prompt = SUMMARY_PROMPT_TEMPLATE.format(commit_data=commit_data)
     
     try:
         # Try with a smaller model that might have more free credits
@@ -194,13 +681,20 @@ def generate_summary_with_anthropic(commit_data):
                 {"role": "user", "content": prompt}
             ]
         )
-        return response.content[0].text
     except Exception as e:
         print(f"Error generating summary with Anthropic: {e}")
         print("Falling back to basic summary.")
-        return basic_summary
+        return generate_basic_summary(commit_data)
+    
+    summary = response.content[0].text
+    try:
+        store_summary(commit_data, summary)
+    except Exception as e:
+        # The summary is already paid for; a cache failure shouldn't lose it
+        print(f"Error caching summary: {e}")
+    return summary
 
-def main():
+async def main():
     # Check for required environment variables
     if not GITHUB_TOKEN:
         print("Error: GITHUB_TOKEN environment variable not set")
@@ -210,14 +704,28 @@ def main():
         print("Error: ANTHROPIC_API_KEY environment variable not set")
         return
     
-    print("Fetching repositories where you have made commits...")
-    user_repos_with_commits = get_user_commits_in_repos()
+    use_anthropic = not _BAD_KEY.match(ANTHROPIC_API_KEY)
+    if not use_anthropic:
+        print("Anthropic API key not properly configured. Using basic summary.")
     
-    repos_with_commits = []
-    for repo_owner, repo_name in user_repos_with_commits:
-        print(f"Fetching commits for {repo_owner}/{repo_name}...")
-        commits = get_user_commits(repo_owner, repo_name, one_week_ago)
+    # HTTP/2 multiplexes every GitHub query over a single connection
+    http_limits = httpx.Limits(max_connections=20, max_keepalive_connections=20)
+    async with httpx.AsyncClient(http2=True, limits=http_limits, headers=headers) as client:
+        user_info = get_user_info()
+        if not user_info:
+            return
+        
+        print("Searching for your commits from the past week...")
+        one_week_ago = since_iso()
+        commits_by_repo, complete = await get_user_commits_in_repos(client, user_info['login'], one_week_ago)
         
+        # The search results are enough unless they were capped or a page failed
+        if commits_by_repo and not complete:
+            print(f"Search results incomplete; fetching full history for {len(commits_by_repo)} repositories...")
+            commits_by_repo = await get_commits_for_repos(client, list(commits_by_repo), user_info, one_week_ago)
+    
+    repos_with_commits = []
+    for (repo_owner, repo_name), commits in commits_by_repo.items():
         if commits:
             repos_with_commits.append({
                 'repo_name': f"{repo_owner}/{repo_name}",
@@ -230,8 +738,11 @@ def main():
     
     commit_data = format_commit_data(repos_with_commits)
     
-    print("\nGenerating summary with Anthropic...")
-    summary = generate_summary_with_anthropic(commit_data)
+    if use_anthropic:
+        print("\nGenerating summary with Anthropic...")
+        summary = generate_summary_with_anthropic(commit_data)
+    else:
+        summary = generate_basic_summary(commit_data)
     
     print("\n" + "=" * 50)
     print("WEEKLY COMMIT SUMMARY")
@@ -239,4 +750,4 @@ def main():
     print(summary)
 
 if __name__ == "__main__":
-    main()
+    asyncio.run(main())